@@ -1,11 +1,17 @@
 import os
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field, field_validator
 
 
 class Settings(BaseSettings):
-    """Application settings loaded from environment variables"""
+    """
+    Application settings loaded from environment variables
+
+    Variable names are case-sensitive and must match the uppercase field
+    names below (e.g. ``DATABASE_URL``, not ``database_url``).
+    """
 
     APP_NAME: str = "Resume Parser API"
     APP_VERSION: str = "1.0.0"
@@ -15,11 +21,20 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api"
 
     DATABASE_URL: str = Field(...)
+    DB_POOL_SIZE: int = Field(default=20)
+    DB_MAX_OVERFLOW: int = Field(default=30)
+    DB_POOL_TIMEOUT: int = Field(default=30)
+    DB_POOL_RECYCLE: int = Field(default=3600)
+    DB_USE_NULLPOOL: bool = Field(default=False)
 
     OPENAI_API_KEY: str = Field(...)
     OPENAI_MODEL: str = Field(default="gpt-4")
     OPENAI_TEMPERATURE: float = Field(default=0.1)
     OPENAI_MAX_TOKENS: int = Field(default=4000)
+    LLM_CONCURRENCY: int = Field(default=4)
+    LLM_CACHE_ENABLED: bool = Field(default=True)
+    LLM_CACHE_TTL: int = Field(default=7 * 24 * 3600)
+    LLM_CACHE_DIR: str = Field(default="data/cache/llm")
 
     MAX_FILE_SIZE: int = Field(default=10485760)
     ALLOWED_EXTENSIONS: List[str] = Field(default=[".pdf", ".docx"])
@@ -30,12 +45,16 @@ class Settings(BaseSettings):
         default=["http://localhost:8501", "http://127.0.0.1:8501"]
     )
 
+    ALLOWED_HOSTS: List[str] = Field(default=["*"])
+
     UPLOAD_DIR: str = Field(default="data/uploads")
+    EXTRACT_CACHE_DIR: str = Field(default="data/cache/extract")
+    EXTRACT_CACHE_TTL: Optional[int] = Field(default=7 * 24 * 3600)
 
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
-        "case_sensitive": False,
+        "case_sensitive": True,
         "extra": "ignore",
     }
 
@@ -55,6 +74,14 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(",")]
         return v
 
+    @field_validator("ALLOWED_HOSTS", mode="before")
+    @classmethod
+    def validate_allowed_hosts(cls, v):
+        """Validate and parse trusted hosts"""
+        if isinstance(v, str):
+            return [host.strip() for host in v.split(",")]
+        return v
+
     @property
     def is_debug(self) -> bool:
         """Check if debug mode is enabled"""
@@ -73,7 +100,10 @@ class Settings(BaseSettings):
         os.makedirs(self.UPLOAD_DIR, exist_ok=True)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the cached application settings instance"""
+    return Settings()
 
 
-settings.ensure_upload_directory()
+settings = get_settings()
@@ -1,7 +1,8 @@
 from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
 from sqlalchemy import text
 
 from app.core.config import settings
@@ -10,21 +11,38 @@ from app.utils.logger import get_logger
 logger = get_logger("app.database")
 
 
+if settings.DB_USE_NULLPOOL:
+    # Open a fresh connection per checkout so --reload and short-lived
+    # workers never hold on to pooled connections
+    pool_options = {"poolclass": NullPool}
+else:
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_use_lifo": True,
+    }
+
+
 engine = create_async_engine(
     settings.database_url_async,
     echo=settings.is_debug,
     future=True,
     pool_pre_ping=True,
-    pool_recycle=3600,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        "server_settings": {"tcp_keepalives_idle": "30"},
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 256,
+    },
+    **pool_options,
 )
 
 
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     engine,
-    class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False,
-    autocommit=False,
 )
 
 
@@ -35,6 +53,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency function to get database session
 
+    The session is not committed automatically; handlers that write
+    must call ``await db.commit()`` themselves.
+
     Usage in FastAPI routes:
         @router.get("/")
         async def read_items(db: AsyncSession = Depends(get_db)):
@@ -43,10 +64,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except SQLAlchemyError as e:
             await session.rollback()
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: {}", e)
             raise
         finally:
             await session.close()
@@ -63,7 +83,7 @@ async def create_tables():
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created successfully")
     except Exception as e:
-        logger.error(f"Error creating database tables: {e}")
+        logger.error("Error creating database tables: {}", e)
         raise
 
 
@@ -78,7 +98,7 @@ async def drop_tables():
             await conn.run_sync(Base.metadata.drop_all)
         logger.info("Database tables dropped successfully")
     except Exception as e:
-        logger.error(f"Error dropping database tables: {e}")
+        logger.error("Error dropping database tables: {}", e)
         raise
 
 
@@ -90,12 +110,12 @@ async def test_connection():
         bool: True if connection successful, False otherwise
     """
     try:
-        async with engine.begin() as conn:
+        async with engine.connect() as conn:
             await conn.execute(text("SELECT 1"))
         logger.info("Database connection test successful")
         return True
     except Exception as e:
-        logger.error(f"Database connection test failed: {e}")
+        logger.error("Database connection test failed: {}", e)
         return False
 
 
@@ -109,7 +129,7 @@ class DatabaseManager:
             result = await session.execute(query, params)
             return result
         except SQLAlchemyError as e:
-            logger.error(f"Query execution error: {e}")
+            logger.error("Query execution error: {}", e)
             raise
 
     @staticmethod
@@ -118,7 +138,7 @@ class DatabaseManager:
         try:
             await session.commit()
         except SQLAlchemyError as e:
-            logger.error(f"Transaction commit error: {e}")
+            logger.error("Transaction commit error: {}", e)
             raise
 
     @staticmethod
@@ -127,5 +147,5 @@ class DatabaseManager:
         try:
             await session.rollback()
         except SQLAlchemyError as e:
-            logger.error(f"Transaction rollback error: {e}")
+            logger.error("Transaction rollback error: {}", e)
             raise
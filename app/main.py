@@ -1,32 +1,62 @@
+import time
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 
 from app.schemas import HealthResponse
 from app.core.config import settings
 from app.utils.logger import setup_logger
 from app.database import create_tables, test_connection
+from app.utils import extract_cache
+from app.services import llm_cache
+from app.utils.extractor import start_pdf_pool, shutdown_pdf_pool
 from app.routes.resume_routes import router as resume_router
 
 
 setup_logger()
 logger = logging.getLogger("app.main")
 
+HEALTH_CACHE_TTL = 2.0
+_health_cache = {"ts": 0.0, "ok": False}
+
+
+async def cached_test_connection() -> bool:
+    """Test database connection, reusing the result for HEALTH_CACHE_TTL seconds"""
+    now = time.monotonic()
+    if _health_cache["ts"] and now - _health_cache["ts"] < HEALTH_CACHE_TTL:
+        return _health_cache["ok"]
+
+    _health_cache["ok"] = await test_connection()
+    _health_cache["ts"] = now
+    return _health_cache["ok"]
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
 
     logger.info("Starting Resume Parser Application")
+    settings.ensure_upload_directory()
+    await asyncio.to_thread(extract_cache.prune_expired)
+    await asyncio.to_thread(llm_cache.prune_expired)
     await create_tables()
     logger.info("Database tables created/verified")
 
+    app.openapi()
+    logger.info("OpenAPI schema generated")
+
+    start_pdf_pool()
+
     yield
 
     logger.info("Shutting down Resume Parser Application")
+    shutdown_pdf_pool()
 
 
 def create_app() -> FastAPI:
@@ -40,15 +70,20 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.ALLOWED_HOSTS)
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
     if settings.BACKEND_CORS_ORIGINS:
         app.add_middleware(
             CORSMiddleware,
             allow_origins=settings.BACKEND_CORS_ORIGINS,
             allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
+            allow_methods=["GET", "POST"],
+            allow_headers=["Authorization", "Content-Type"],
+            max_age=86400,
         )
 
     app.include_router(resume_router, prefix=settings.API_V1_STR)
@@ -68,26 +103,30 @@ def create_app() -> FastAPI:
         return HealthResponse(
             status=status.HTTP_200_OK,
             version=settings.APP_VERSION,
-            database="connected" if await test_connection() else "Failed",
+            database="connected" if await cached_test_connection() else "Failed",
         )
 
     @app.exception_handler(HTTPException)
     async def http_exception_handler(request, exc):
-        logger.error(f"HTTP Exception: {exc.detail}")
-        return JSONResponse(status_code=exc.status_code, content={"error": exc.detail})
+        logger.error("HTTP Exception: %s", exc.detail)
+        return ORJSONResponse(
+            status_code=exc.status_code, content={"error": exc.detail}
+        )
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request, exc):
-        logger.error(f"Validation Error: {exc.errors()}")
-        return JSONResponse(
+        logger.error("Validation Error: %s", exc.errors())
+        return ORJSONResponse(
             status_code=422,
             content={"error": "Validation error", "details": exc.errors()},
         )
 
     @app.exception_handler(Exception)
     async def general_exception_handler(request, exc):
-        logger.error(f"Unhandled Exception: {str(exc)}", exc_info=True)
-        return JSONResponse(status_code=500, content={"error": "Internal server error"})
+        logger.error("Unhandled Exception: %s", exc, exc_info=True)
+        return ORJSONResponse(
+            status_code=500, content={"error": "Internal server error"}
+        )
 
     return app
 
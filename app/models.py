@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, JSON, DateTime, Text, Index
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
-from sqlalchemy.ext.mutable import MutableDict
+from typing import Optional
+from sqlalchemy import BigInteger, Column, String, DateTime, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 
 from app.database import Base
 
@@ -13,6 +13,9 @@ class Resume(Base):
 
     This table stores the extracted structured information from resumes
     along with metadata about the original file.
+
+    ``extracted_data`` is not mutation-tracked: assign a new dict instead of
+    modifying the stored one in place, or the change will not be flushed.
     """
 
     __tablename__ = "resumes"
@@ -25,20 +28,18 @@ class Resume(Base):
         nullable=False,
     )
 
-    original_filename = Column(String(255), nullable=False, index=True)
+    original_filename = Column(String(255), nullable=False)
     file_type = Column(String(10), nullable=False)
 
-    extracted_data = Column(MutableDict.as_mutable(JSON), nullable=False)
+    extracted_data = Column(JSONB, nullable=False)
 
     file_path = Column(String(500), nullable=True)
 
-    processing_status = Column(
-        String(50), default="completed", nullable=False, index=True
-    )
+    processing_status = Column(String(50), default="completed", nullable=False)
     processing_error = Column(Text, nullable=True)
 
     created_at = Column(
-        DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True
+        DateTime(timezone=True), default=datetime.utcnow, nullable=False
     )
     updated_at = Column(
         DateTime(timezone=True),
@@ -48,9 +49,15 @@ class Resume(Base):
     )
 
     __table_args__ = (
-        Index("idx_resumes_created_at", "created_at"),
+        Index("idx_resumes_created_at_desc", created_at.desc()),
         Index("idx_resumes_filename", "original_filename"),
         Index("idx_resumes_status", "processing_status"),
+        Index(
+            "idx_resumes_failed",
+            "created_at",
+            postgresql_where=text("processing_status = 'failed'"),
+        ),
+        Index("idx_resumes_extracted_gin", "extracted_data", postgresql_using="gin"),
         {"extend_existing": True},
     )
 
@@ -105,7 +112,7 @@ class FileMetadata(Base):
     original_filename = Column(String(255), nullable=False)
     stored_filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
-    file_size = Column(String(50), nullable=True)
+    file_size = Column(BigInteger, nullable=True)
     file_type = Column(String(10), nullable=False)
 
     upload_ip = Column(String(50), nullable=True)
@@ -120,6 +127,13 @@ class FileMetadata(Base):
         {"extend_existing": True},
     )
 
+    @property
+    def file_size_display(self) -> Optional[str]:
+        """Human-readable file size, e.g. '1,234 bytes'"""
+        if self.file_size is None:
+            return None
+        return f"{self.file_size:,} bytes"
+
     def __repr__(self):
         return f"<FileMetadata(id={self.id}, filename='{self.original_filename}', created_at={self.created_at})>"
 
@@ -3,11 +3,10 @@ from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.config import settings
 from app.database import get_db
 from app.models import Resume
-from app.schemas import UploadResumeResponse, GetResumeResponse, ResumeDataSchema
-from app.services.file_service import file_service, FileMetadataService
-from app.services.parser_service import parser_service
+from app.schemas import UploadResumeResponse, GetResumeResponse
 from app.utils.logger import get_logger
 
 router = APIRouter()
@@ -35,10 +34,13 @@ async def upload_resume(
         HTTPException: If upload or processing fails
     """
 
+    from app.services.file_service import file_service, FileMetadataService
+    from app.services.parser_service import parser_service
+
     client_ip = request.client.host if request.client else "unknown"
     user_agent = request.headers.get("user-agent", "unknown")
 
-    logger.info(f"Resume upload request from {client_ip}")
+    logger.info("Resume upload request from {}", client_ip)
 
     try:
 
@@ -47,7 +49,13 @@ async def upload_resume(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="No file provided"
             )
 
-        document_id = str(uuid.uuid4())
+        if file.size is not None and file.size > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE} bytes",
+            )
+
+        document_id = uuid.uuid4()
 
         file_metadata = await file_service.save_upload_file(
             file, upload_ip=client_ip, user_agent=user_agent
@@ -69,12 +77,13 @@ async def upload_resume(
             original_filename=file_metadata["original_filename"],
             unique_id=file_metadata["unique_id"],
             db_session=db,
+            file_content=file_metadata["content"],
         )
 
         if not success:
 
             error_resume = Resume(
-                id=uuid.UUID(document_id),
+                id=document_id,
                 original_filename=file_metadata["original_filename"],
                 file_type=file_metadata["file_type"],
                 extracted_data={},
@@ -83,9 +92,12 @@ async def upload_resume(
                 processing_error=error_message,
             )
             db.add(error_resume)
-            await db.commit()
 
-            logger.error(f"Resume processing failed: {error_message}")
+        # File metadata and the resume (or failure) record share one transaction
+        await db.commit()
+
+        if not success:
+            logger.error("Resume processing failed: {}", error_message)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to process resume: {error_message}",
@@ -93,19 +105,20 @@ async def upload_resume(
 
         extracted_data = result_data.get("extracted_resume_data", {})
 
-        logger.info(f"Resume processed successfully: {document_id}")
+        logger.info("Resume processed successfully: {}", document_id)
 
-        return UploadResumeResponse(
-            document_id=uuid.UUID(result_data["document_id"]),
-            message="Resume uploaded and processed successfully",
-            extracted_resume_data=ResumeDataSchema.parse_obj(extracted_data),
-        )
+        # Validated once by FastAPI against response_model on the way out
+        return {
+            "document_id": result_data["document_id"],
+            "message": "Resume uploaded and processed successfully",
+            "extracted_resume_data": extracted_data,
+        }
 
     except HTTPException:
 
         raise
     except Exception as e:
-        logger.error(f"Unexpected error during resume upload: {e}", exc_info=True)
+        logger.opt(exception=True).error("Unexpected error during resume upload: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred during resume processing",
@@ -127,18 +140,27 @@ async def get_resume(document_id: uuid.UUID, db: AsyncSession = Depends(get_db))
     Raises:
         HTTPException: If resume not found
     """
+    document_id_str = str(document_id)
+
     try:
 
-        result = await db.execute(select(Resume).where(Resume.id == document_id))
-        resume = result.scalar_one_or_none()
+        result = await db.execute(
+            select(
+                Resume.id,
+                Resume.original_filename,
+                Resume.extracted_data,
+                Resume.created_at,
+            ).where(Resume.id == document_id)
+        )
+        resume = result.first()
 
         if not resume:
-            logger.warning(f"Resume not found: {document_id}")
+            logger.warning("Resume not found: {}", document_id_str)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
             )
 
-        logger.info(f"Retrieved resume: {document_id}")
+        logger.info("Retrieved resume: {}", document_id_str)
 
         return GetResumeResponse(
             document_id=resume.id,
@@ -151,7 +173,9 @@ async def get_resume(document_id: uuid.UUID, db: AsyncSession = Depends(get_db))
 
         raise
     except Exception as e:
-        logger.error(f"Error retrieving resume {document_id}: {e}", exc_info=True)
+        logger.opt(exception=True).error(
+            "Error retrieving resume {}: {}", document_id_str, e
+        )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred while retrieving the resume",
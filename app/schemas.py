@@ -9,6 +9,7 @@ class ContactInfoSchema(BaseModel):
     """Schema for contact information extracted from resumes"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "name": "John Doe",
@@ -16,7 +17,7 @@ class ContactInfoSchema(BaseModel):
                 "phone": "+1-555-0123",
                 "location": "New York, NY",
             }
-        }
+        },
     )
 
     name: str = Field(..., description="Full name of the candidate")
@@ -29,6 +30,7 @@ class WorkExperienceSchema(BaseModel):
     """Schema for work experience entries"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "role": "Senior Software Engineer",
@@ -36,7 +38,7 @@ class WorkExperienceSchema(BaseModel):
                 "duration": "Jan 2020 - Present",
                 "responsibilities": "Lead development team, architect microservices, implement CI/CD pipeline",
             }
-        }
+        },
     )
 
     role: str = Field(..., description="Job title or position")
@@ -51,6 +53,7 @@ class EducationSchema(BaseModel):
     """Schema for education entries"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "degree": "Bachelor of Science in Computer Science",
@@ -58,7 +61,7 @@ class EducationSchema(BaseModel):
                 "year": "2019",
                 "gpa": "3.8",
             }
-        }
+        },
     )
 
     degree: str = Field(..., description="Degree obtained")
@@ -71,12 +74,13 @@ class SkillsSchema(BaseModel):
     """Schema for skills"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "technical_skills": ["Python", "FastAPI", "PostgreSQL", "Docker"],
                 "soft_skills": ["Leadership", "Communication", "Teamwork"],
             }
-        }
+        },
     )
 
     technical_skills: List[str] = Field(
@@ -89,13 +93,14 @@ class CertificationSchema(BaseModel):
     """Schema for certifications"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "name": "AWS Certified Solutions Architect",
                 "issuing_organization": "Amazon Web Services",
                 "year": "2022",
             }
-        }
+        },
     )
 
     name: str = Field(..., description="Certification name")
@@ -109,6 +114,7 @@ class ResumeDataSchema(BaseModel):
     """Complete structured resume data schema"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "contact_info": {
@@ -145,7 +151,7 @@ class ResumeDataSchema(BaseModel):
                     }
                 ],
             }
-        }
+        },
     )
 
     contact_information: ContactInfoSchema = Field(
@@ -169,13 +175,16 @@ class ResumeDataSchema(BaseModel):
 class UploadResumeRequest(BaseModel):
     """Schema for resume upload request"""
 
-    model_config = ConfigDict(json_schema_extra={"example": {"file": "resume.pdf"}})
+    model_config = ConfigDict(
+        defer_build=True, json_schema_extra={"example": {"file": "resume.pdf"}}
+    )
 
 
 class UploadResumeResponse(BaseModel):
     """Schema for resume upload response"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "document_id": "123e4567-e89b-12d3-a456-426614174000",
@@ -189,7 +198,7 @@ class UploadResumeResponse(BaseModel):
                     "certifications": [],
                 },
             }
-        }
+        },
     )
 
     document_id: UUID = Field(
@@ -205,6 +214,7 @@ class GetResumeResponse(BaseModel):
     """Schema for getting resume response"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "document_id": "123e4567-e89b-12d3-a456-426614174000",
@@ -214,7 +224,7 @@ class GetResumeResponse(BaseModel):
                 },
                 "created_at": "2023-11-15T10:30:00Z",
             }
-        }
+        },
     )
 
     document_id: UUID = Field(..., description="Unique identifier for the resume")
@@ -229,12 +239,13 @@ class ErrorResponse(BaseModel):
     """Schema for error responses"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "error": "Invalid file type. Only PDF and DOCX files are supported.",
                 "detail": "file_type_not_supported",
             }
-        }
+        },
     )
 
     error: str = Field(..., description="Error message")
@@ -245,13 +256,14 @@ class HealthResponse(BaseModel):
     """Schema for health check response"""
 
     model_config = ConfigDict(
+        defer_build=True,
         json_schema_extra={
             "example": {
                 "status": "healthy",
                 "version": "1.0.0",
                 "database": "connected",
             }
-        }
+        },
     )
 
     status: int = Field(..., description="Application status")
@@ -262,6 +274,8 @@ class HealthResponse(BaseModel):
 class FileProcessingResult(BaseModel):
     """Schema for file processing results"""
 
+    model_config = ConfigDict(defer_build=True)
+
     success: bool = Field(..., description="Whether processing was successful")
     document_id: Optional[UUID] = Field(None, description="Document ID if successful")
     error_message: Optional[str] = Field(None, description="Error message if failed")
@@ -273,6 +287,8 @@ class FileProcessingResult(BaseModel):
 class ProcessingStatus(BaseModel):
     """Schema for processing status"""
 
+    model_config = ConfigDict(defer_build=True)
+
     status: str = Field(..., description="Current processing status")
     progress: int = Field(..., ge=0, le=100, description="Progress percentage")
     message: Optional[str] = Field(None, description="Additional status message")
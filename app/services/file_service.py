@@ -1,10 +1,13 @@
-import uuid
-import hashlib
+import os
+import time
+import asyncio
 import aiofiles
+from collections import OrderedDict
 from typing import Optional
 from pathlib import Path
 
 from fastapi import UploadFile, HTTPException
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -18,6 +21,15 @@ from app.utils.logger import (
 
 logger = get_logger("app.services.file_service")
 
+UPLOAD_CHUNK_SIZE = 1 << 20
+SMALL_FILE_SIZE = 4 << 20
+STAT_CACHE_SIZE = 10_000
+METADATA_MISS_TTL = 60.0
+METADATA_MISS_CACHE_SIZE = 4096
+
+# stored_filename -> monotonic expiry time of a cached "not found" lookup
+_metadata_misses: OrderedDict[str, float] = OrderedDict()
+
 
 class FileService:
     """Service for file operations"""
@@ -29,53 +41,113 @@ class FileService:
             ext.lower() for ext in settings.ALLOWED_EXTENSIONS
         )
 
+        self._stat_cache: OrderedDict[str, Optional[os.stat_result]] = OrderedDict()
+
         self.upload_dir.mkdir(parents=True, exist_ok=True)
 
-    def validate_file(self, file: UploadFile) -> None:
+    def _cached_stat(self, filename: str) -> os.stat_result:
+        """
+        Stat a stored file, reusing recent results
+
+        Missing files are cached as None so repeated probes for the same
+        name do not hit the filesystem again.
+
+        Args:
+            filename (str): Stored filename
+
+        Returns:
+            os.stat_result: Stat result for the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        if filename in self._stat_cache:
+            self._stat_cache.move_to_end(filename)
+            stat = self._stat_cache[filename]
+        else:
+            try:
+                stat = os.stat(self.upload_dir / filename)
+            except FileNotFoundError:
+                stat = None
+            self._stat_cache[filename] = stat
+            if len(self._stat_cache) > STAT_CACHE_SIZE:
+                self._stat_cache.popitem(last=False)
+
+        if stat is None:
+            raise FileNotFoundError(filename)
+        return stat
+
+    def validate_file(
+        self, file: UploadFile, file_extension: Optional[str] = None
+    ) -> None:
         """
         Validate uploaded file
 
+        Runs before anything is written, so an upload whose declared size
+        is already over the limit never touches the filesystem.
+
         Args:
             file (UploadFile): File to validate
+            file_extension (str, optional): Precomputed lowercase extension
 
         Raises:
             HTTPException: If file validation fails
         """
 
-        file_extension = Path(file.filename).suffix.lower()
+        if file_extension is None:
+            file_extension = os.path.splitext(file.filename)[1].lower()
         if file_extension not in self.allowed_extensions:
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported file type: {file_extension}. Allowed types: {', '.join(self.allowed_extensions)}",
             )
 
-        if hasattr(file, "size") and file.size and file.size > self.max_file_size:
+        size_hint = getattr(file, "size", None)
+        if size_hint is not None and size_hint > self.max_file_size:
             raise HTTPException(
                 status_code=413,
                 detail=f"File too large. Maximum size: {self.max_file_size} bytes",
             )
 
-    def generate_filename(self, original_filename: str) -> str | str:
+    def generate_filename(
+        self, original_filename: str, file_extension: Optional[str] = None
+    ) -> str | str:
         """
         Generate a unique filename for storage
 
         Args:
             original_filename (str): Original filename
+            file_extension (str, optional): Precomputed lowercase extension
 
         Returns:
             str: Unique id
             str: Generated filename
         """
 
-        file_extension = Path(original_filename).suffix.lower()
+        if file_extension is None:
+            file_extension = os.path.splitext(original_filename)[1].lower()
 
-        unique_id = str(uuid.uuid4())[:8]
-        timestamp = str(
-            int(hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest(), 16) % 100000000
-        )
+        unique_id = os.urandom(4).hex()
+        timestamp = str(time.time_ns() % 100_000_000)
 
         return unique_id, f"{unique_id}_{timestamp}{file_extension}"
 
+    def _check_stream_size(self, file_size: int) -> None:
+        """
+        Reject an upload whose streamed size exceeds the limit
+
+        Args:
+            file_size (int): Number of bytes read so far
+
+        Raises:
+            HTTPException: If the size exceeds max_file_size
+        """
+        if file_size > self.max_file_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large after reading: {file_size} bytes",
+            )
+
     async def save_upload_file(
         self,
         file: UploadFile,
@@ -85,55 +157,73 @@ class FileService:
         """
         Save uploaded file and return metadata
 
+        Uploads known to be smaller than SMALL_FILE_SIZE are read at once and
+        written with a single thread hop. Anything else is streamed to disk
+        in UPLOAD_CHUNK_SIZE chunks with the size limit enforced while
+        streaming, so a large file is never held in memory.
+
         Args:
             file (UploadFile): File to save
             upload_ip (str, optional): Upload IP address
             user_agent (str, optional): User agent string
 
         Returns:
-            dict: File metadata including storage information
+            dict: File metadata including storage information, plus the
+                file's bytes under "content" when the small-file path read
+                them into memory (None otherwise)
         """
 
-        self.validate_file(file)
+        file_extension = os.path.splitext(file.filename)[1].lower()
+
+        self.validate_file(file, file_extension)
 
-        unique_id, stored_filename = self.generate_filename(file.filename)
+        unique_id, stored_filename = self.generate_filename(
+            file.filename, file_extension
+        )
         file_path = self.upload_dir / stored_filename
 
-        log_upload_start(file.filename, getattr(file, "size", "unknown"))
+        size_hint = getattr(file, "size", None)
+        log_upload_start(file.filename, size_hint or "unknown")
 
         try:
 
-            content = await file.read()
-
-            if len(content) > self.max_file_size:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"File too large after reading: {len(content)} bytes",
-                )
-
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(content)
+            content = None
+            if size_hint is not None and size_hint < SMALL_FILE_SIZE:
+                content = await file.read()
+                file_size = len(content)
+                self._check_stream_size(file_size)
+                await asyncio.to_thread(file_path.write_bytes, content)
+            else:
+                file_size = 0
+                async with aiofiles.open(file_path, "wb") as f:
+                    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                        file_size += len(chunk)
+                        self._check_stream_size(file_size)
+                        await f.write(memoryview(chunk))
 
             file_metadata = {
                 "original_filename": file.filename,
                 "stored_filename": stored_filename,
                 "file_path": str(file_path),
-                "file_size": len(content),
-                "file_type": Path(file.filename).suffix.lower().lstrip("."),
+                "file_size": file_size,
+                "file_type": file_extension[1:],
                 "upload_ip": upload_ip,
                 "user_agent": user_agent,
                 "unique_id": unique_id,
+                "content": content,
             }
 
-            log_upload_success(file.filename, str(uuid.uuid4()))
+            self._stat_cache.pop(stored_filename, None)
+            log_upload_success(file.filename, unique_id)
 
             return file_metadata
 
         except Exception as e:
             logger.error(f"Error saving file {file.filename}: {e}")
 
-            if file_path.exists():
-                file_path.unlink()
+            file_path.unlink(missing_ok=True)
+            if isinstance(e, HTTPException):
+                raise
             raise HTTPException(
                 status_code=500, detail=f"Failed to save file: {str(e)}"
             )
@@ -148,15 +238,15 @@ class FileService:
         Returns:
             bool: True if deleted, False if file not found
         """
+        self._stat_cache.pop(filename, None)
         try:
             file_path = self.upload_dir / filename
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"Deleted file: {filename}")
-                return True
-            else:
-                logger.warning(f"File not found for deletion: {filename}")
-                return False
+            file_path.unlink()
+            logger.info(f"Deleted file: {filename}")
+            return True
+        except FileNotFoundError:
+            logger.warning(f"File not found for deletion: {filename}")
+            return False
         except Exception as e:
             logger.error(f"Error deleting file {filename}: {e}")
             return False
@@ -183,8 +273,11 @@ class FileService:
         Returns:
             bool: True if file exists
         """
-        file_path = self.upload_dir / filename
-        return file_path.exists()
+        try:
+            self._cached_stat(filename)
+            return True
+        except FileNotFoundError:
+            return False
 
     def get_file_size(self, filename: str) -> Optional[int]:
         """
@@ -196,10 +289,12 @@ class FileService:
         Returns:
             Optional[int]: File size in bytes, None if file not found
         """
-        file_path = self.upload_dir / filename
         try:
-            return file_path.stat().st_size if file_path.exists() else None
-        except Exception:
+            return self._cached_stat(filename).st_size
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error getting file size for {filename}: {e}")
             return None
 
     def get_file_info(self, filename: str) -> Optional[dict]:
@@ -212,19 +307,17 @@ class FileService:
         Returns:
             Optional[dict]: File information or None if file not found
         """
-        file_path = self.upload_dir / filename
-        if not file_path.exists():
-            return None
-
         try:
-            stat = file_path.stat()
+            stat = self._cached_stat(filename)
             return {
                 "filename": filename,
                 "size": stat.st_size,
                 "created": stat.st_ctime,
                 "modified": stat.st_mtime,
-                "path": str(file_path),
+                "path": str(self.upload_dir / filename),
             }
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"Error getting file info for {filename}: {e}")
             return None
@@ -248,7 +341,10 @@ class FileMetadataService:
         user_agent: Optional[str] = None,
     ) -> FileMetadata:
         """
-        Create file metadata record in database
+        Add a file metadata record to the session
+
+        The record is only staged; the caller commits it together with the
+        rest of the request's writes.
 
         Args:
             db (AsyncSession): Database session
@@ -268,21 +364,19 @@ class FileMetadataService:
                 original_filename=original_filename,
                 stored_filename=stored_filename,
                 file_path=file_path,
-                file_size=f"{file_size:,} bytes",
+                file_size=file_size,
                 file_type=file_type,
                 upload_ip=upload_ip,
                 user_agent=user_agent,
             )
 
             db.add(metadata)
-            await db.commit()
-            await db.refresh(metadata)
+            _metadata_misses.pop(stored_filename, None)
 
             logger.info(f"Created file metadata for {stored_filename}")
             return metadata
 
         except Exception as e:
-            await db.rollback()
             logger.error(f"Error creating file metadata: {e}")
             raise
 
@@ -293,6 +387,9 @@ class FileMetadataService:
         """
         Get file metadata by stored filename
 
+        Lookups that found nothing are remembered for METADATA_MISS_TTL
+        seconds so repeated polls for the same name skip the query.
+
         Args:
             db (AsyncSession): Database session
             stored_filename (str): Stored filename
@@ -300,9 +397,13 @@ class FileMetadataService:
         Returns:
             Optional[FileMetadata]: File metadata or None if not found
         """
-        try:
-            from sqlalchemy import select
+        expires_at = _metadata_misses.get(stored_filename)
+        if expires_at is not None:
+            if time.monotonic() < expires_at:
+                return None
+            del _metadata_misses[stored_filename]
 
+        try:
             result = await db.execute(
                 select(FileMetadata).where(
                     FileMetadata.stored_filename == stored_filename
@@ -310,6 +411,11 @@ class FileMetadataService:
             )
             metadata = result.scalar_one_or_none()
 
+            if metadata is None:
+                _metadata_misses[stored_filename] = time.monotonic() + METADATA_MISS_TTL
+                if len(_metadata_misses) > METADATA_MISS_CACHE_SIZE:
+                    _metadata_misses.popitem(last=False)
+
             return metadata
 
         except Exception as e:
@@ -333,6 +439,7 @@ class FileMetadataService:
             if metadata:
                 await db.delete(metadata)
                 await db.commit()
+                _metadata_misses.pop(stored_filename, None)
                 logger.info(f"Deleted file metadata for {stored_filename}")
                 return True
             return False
@@ -0,0 +1,103 @@
+import hashlib
+from typing import Optional, Dict, Any
+
+import orjson
+
+from app.core.config import settings
+from app.schemas import ResumeDataSchema
+from app.services.llm_service import ResumeExtractionPrompt
+from app.utils.file_cache import FileCache
+from app.utils.logger import get_logger
+
+logger = get_logger("app.services.llm_cache")
+
+_cache = FileCache("LLM", settings.LLM_CACHE_DIR, ".json", settings.LLM_CACHE_TTL)
+
+# Everything besides the model and resume text that shapes a response, so
+# editing a prompt or the schema invalidates entries made with the old ones
+_PROMPT_FINGERPRINT = hashlib.sha256(
+    b"\0".join(
+        [
+            ResumeExtractionPrompt.SYSTEM_PROMPT.encode(),
+            ResumeExtractionPrompt.HUMAN_PROMPT_TEMPLATE.encode(),
+            ResumeExtractionPrompt.CHUNK_NOTES_PROMPT_TEMPLATE.encode(),
+            orjson.dumps(
+                ResumeDataSchema.model_json_schema(), option=orjson.OPT_SORT_KEYS
+            ),
+        ]
+    )
+).hexdigest()
+
+
+def prompt_hash(resume_text: str) -> str:
+    """
+    Compute the cache key for an extraction request
+
+    The model name, the prompt templates and the ResumeDataSchema JSON
+    schema are part of the key, so changing any of them does not serve
+    responses produced under the old ones.
+
+    Args:
+        resume_text (str): Cleaned resume text sent to the LLM
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256(settings.OPENAI_MODEL.encode())
+    digest.update(b"\0")
+    digest.update(_PROMPT_FINGERPRINT.encode())
+    digest.update(b"\0")
+    digest.update(resume_text.encode())
+    return digest.hexdigest()
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a cached extraction response
+
+    Args:
+        key (str): Prompt hash from prompt_hash()
+
+    Returns:
+        Optional[Dict[str, Any]]: Cached extracted data, or None on a miss,
+            an expired entry or when the cache is disabled
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+
+    data = _cache.get(key)
+    if data is None:
+        return None
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"Failed to decode LLM cache entry {key}: {e}")
+        return None
+
+
+def put(key: str, response_json: Dict[str, Any]) -> None:
+    """
+    Store an extraction response
+
+    Args:
+        key (str): Prompt hash from prompt_hash()
+        response_json (Dict[str, Any]): JSON-serializable extracted data
+    """
+    if not settings.LLM_CACHE_ENABLED:
+        return
+
+    _cache.put(key, orjson.dumps(response_json))
+
+
+def prune_expired() -> int:
+    """
+    Delete every expired cache entry
+
+    Entries hold extracted contact details and work history, so they are
+    removed from disk once expired. Runs even when the cache is disabled,
+    so entries from before it was turned off are cleaned up too.
+
+    Returns:
+        int: Number of entries deleted
+    """
+    return _cache.prune_expired()
@@ -1,8 +1,10 @@
-import json
+import re
+import time
 import asyncio
 from typing import Dict, Any, List
-from datetime import datetime
 
+import httpx
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
@@ -10,10 +12,31 @@ from langchain_core.exceptions import OutputParserException
 
 from app.core.config import settings
 from app.schemas import ResumeDataSchema
-from app.utils.logger import get_logger, log_llm_success
+from app.utils.logger import get_logger, log_llm_call, log_llm_success
 
 logger = get_logger("app.services.llm_service")
 
+_WS_RE = re.compile(r"\s+")
+_NEWLINE_RE = re.compile(r"\n+")
+_TAB_RE = re.compile(r"\t+")
+
+# Matched by longest prefix, so dated names like gpt-4-0613 resolve to
+# their family instead of falling through to the default
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-4-turbo": 128000,
+    "gpt-4-1106-preview": 128000,
+    "gpt-4-0125-preview": 128000,
+    "gpt-4o": 128000,
+    "gpt-4.1": 128000,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_TOKENS = 128000
+PROMPT_OVERHEAD_TOKENS = 1000
+CHARS_PER_TOKEN = 4
+MAX_REDUCE_ROUNDS = 2
+
 
 class ResumeExtractionPrompt:
     """Prompt templates for resume extraction"""
@@ -44,15 +67,27 @@ Do not add any text before or after the JSON object.
 Only return the JSON object with the extracted data.
 """
 
+    # Keep {resume_text} at the very end: everything before it is identical
+    # across requests, which lets the provider reuse the cached prompt prefix.
     HUMAN_PROMPT_TEMPLATE = """
-Please extract structured information from the following resume text:
+Extract the information from the resume text below and return it in the exact JSON format specified by the schema.
+Remember to return ONLY the JSON object, nothing before or after it.
 
 <resume_text>
 {resume_text}
 </resume_text>
+"""
 
-Extract the information and return it in the exact JSON format specified by the schema.
-Remember to return ONLY the JSON object, nothing before or after it.
+    CHUNK_NOTES_PROMPT_TEMPLATE = """
+You are condensing one section of a resume that is too long to parse in a single request.
+
+List every fact in the section below that belongs to contact information, the professional summary,
+work experience, education, skills or certifications as terse bullet points. Keep names, job titles,
+companies, institutions, dates and skill names verbatim. Leave out everything else.
+
+<resume_section>
+{resume_text}
+</resume_section>
 """
 
 
@@ -70,8 +105,14 @@ class LLMService:
             temperature=self.temperature,
             max_tokens=self.max_tokens,
             api_key=self.openai_api_key,
+            http_async_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            ),
+        )
+        self.llm = self.raw_llm.with_structured_output(
+            ResumeDataSchema, include_raw=True
         )
-        self.llm = self.raw_llm.with_structured_output(ResumeDataSchema)
 
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -80,11 +121,43 @@ class LLMService:
             ]
         )
 
+        self.notes_prompt = ChatPromptTemplate.from_messages(
+            [("human", ResumeExtractionPrompt.CHUNK_NOTES_PROMPT_TEMPLATE)]
+        )
+
         self.output_parser = PydanticOutputParser(pydantic_object=ResumeDataSchema)
 
         logger.info(f"LLM Service initialized with model: {self.model_name}")
 
-    async def extract_resume_data(self, resume_text: str) -> Dict[str, Any]:
+    @property
+    def max_input_chars(self) -> int:
+        """Approximate number of resume characters that fit in one extraction call"""
+        prefix = max(
+            (name for name in MODEL_CONTEXT_TOKENS if self.model_name.startswith(name)),
+            key=len,
+            default=None,
+        )
+        context_tokens = MODEL_CONTEXT_TOKENS.get(prefix, DEFAULT_CONTEXT_TOKENS)
+        input_tokens = context_tokens - self.max_tokens - PROMPT_OVERHEAD_TOKENS
+        return max(input_tokens, 0) * CHARS_PER_TOKEN
+
+    async def summarize_chunk(self, resume_text: str) -> str:
+        """
+        Condense a section of a long resume into terse notes
+
+        Args:
+            resume_text (str): Resume text section
+
+        Returns:
+            str: Bullet-point notes for the section
+        """
+        messages = self.notes_prompt.format_prompt(
+            resume_text=resume_text
+        ).to_messages()
+        response = await self.raw_llm.ainvoke(messages)
+        return response.content
+
+    async def extract_resume_data(self, resume_text: str) -> ResumeDataSchema:
         """
         Extract structured resume data from text using GPT-4
 
@@ -92,7 +165,7 @@ class LLMService:
             resume_text (str): Raw resume text
 
         Returns:
-            Dict[str, Any]: Extracted resume data
+            ResumeDataSchema: Extracted resume data
 
         Raises:
             Exception: If extraction fails after retries
@@ -110,18 +183,16 @@ class LLMService:
             try:
                 logger.info(f"LLM extraction attempt {attempt + 1}/{max_retries}")
 
-                start_time = datetime.now()
+                start_time = time.perf_counter()
                 response = await self._call_llm(messages)
-                end_time = datetime.now()
-
-                processing_time = (end_time - start_time).total_seconds()
+                processing_time = time.perf_counter() - start_time
 
                 log_llm_success("resume_extraction", processing_time)
 
                 logger.info(
                     f"Successfully extracted resume data in {processing_time:.2f} seconds"
                 )
-                return response.model_dump()
+                return response
 
             except OutputParserException as e:
                 logger.error(f"Output parsing failed on attempt {attempt + 1}: {e}")
@@ -149,12 +220,26 @@ class LLMService:
             messages: List of messages for LLM
 
         Returns:
-            str: LLM response content
+            ResumeDataSchema: Parsed structured response
         """
         try:
             response = await self.llm.ainvoke(messages)
 
-            return response
+            usage = response["raw"].usage_metadata or {}
+            log_llm_call(
+                usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0),
+                self.model_name,
+                usage.get("input_token_details", {}).get("cache_read", 0),
+            )
+
+            parsed = response["parsed"]
+            if parsed is None:
+                raise OutputParserException(
+                    f"Structured output parsing failed: {response['parsing_error']}"
+                )
+
+            return parsed
 
         except Exception as e:
             logger.error(f"LLM API call failed: {e}")
@@ -179,9 +264,9 @@ class LLMService:
             )
 
             try:
-                json_data = json.loads(response_content)
+                json_data = orjson.loads(response_content)
                 return ResumeDataSchema.model_validate(json_data)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
 
             return self.output_parser.parse(response_content)
@@ -202,7 +287,7 @@ class LLMService:
             bool: True if data is valid
         """
         try:
-            ResumeDataSchema.parse_obj(data)
+            ResumeDataSchema.model_validate(data)
             return True
         except Exception as e:
             logger.error(f"Data validation failed: {e}")
@@ -213,9 +298,9 @@ class ResumeExtractionChain:
     """Orchestrates resume extraction using LangChain components"""
 
     def __init__(self):
-        self.llm_service = LLMService()
+        self.llm_service = llm_service
 
-    async def extract_from_text(self, resume_text: str) -> Dict[str, Any]:
+    async def extract_from_text(self, resume_text: str) -> ResumeDataSchema:
         """
         Extract resume data from text with preprocessing
 
@@ -223,7 +308,7 @@ class ResumeExtractionChain:
             resume_text (str): Raw resume text
 
         Returns:
-            Dict[str, Any]: Extracted resume data
+            ResumeDataSchema: Extracted resume data
         """
         logger.info("Starting resume extraction chain")
 
@@ -234,8 +319,8 @@ class ResumeExtractionChain:
 
         logger.info(f"Processing text length: {len(cleaned_text)} characters")
 
-        if len(cleaned_text) > 8000:
-            logger.info("Text is long, will process in chunks")
+        if len(cleaned_text) > self.llm_service.max_input_chars:
+            logger.info("Text exceeds the model context, will process in chunks")
             return await self._extract_from_chunks(cleaned_text)
         else:
             return await self.llm_service.extract_resume_data(cleaned_text)
@@ -251,115 +336,86 @@ class ResumeExtractionChain:
             str: Processed text
         """
 
-        text = " ".join(text.split())
-
-        import re
-
-        text = re.sub(r"\n+", "\n", text)
-        text = re.sub(r"\t+", " ", text)
+        text = _WS_RE.sub(" ", text)
+        text = _NEWLINE_RE.sub("\n", text)
+        text = _TAB_RE.sub(" ", text)
 
         return text.strip()
 
-    async def _extract_from_chunks(self, resume_text: str) -> Dict[str, Any]:
+    async def _extract_from_chunks(self, resume_text: str) -> ResumeDataSchema:
         """
-        Extract data from multiple text chunks and combine results
+        Extract data from a long resume with a map-reduce pass
+
+        Each chunk is condensed into notes concurrently, then the combined
+        notes are sent through structured extraction once. Notes that still
+        do not fit are condensed again, up to MAX_REDUCE_ROUNDS times, and
+        truncated as a last resort.
 
         Args:
             resume_text (str): Long resume text
 
         Returns:
-            Dict[str, Any]: Combined extracted data
+            ResumeDataSchema: Extracted resume data
         """
-        from app.utils.extractor import chunk_for_llm
-
-        chunks = chunk_for_llm(resume_text, chunk_size=4000, overlap=500)
-        logger.info(f"Text chunked into {len(chunks)} pieces")
-
-        chunk_results = []
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-            try:
-                result = await self.llm_service.extract_resume_data(chunk)
-                chunk_results.append(result)
-            except Exception as e:
-                logger.warning(f"Failed to process chunk {i+1}: {e}")
-                continue
+        max_chars = self.llm_service.max_input_chars
+        notes = await self._summarize_chunks(resume_text)
+
+        for _ in range(MAX_REDUCE_ROUNDS):
+            if len(notes) <= max_chars:
+                break
+            logger.info(
+                f"Combined notes ({len(notes)} chars) exceed the model context, condensing again"
+            )
+            notes = await self._summarize_chunks(notes)
 
-        if not chunk_results:
-            raise Exception("Failed to extract data from any chunks")
+        if len(notes) > max_chars:
+            logger.warning(
+                f"Truncating combined notes from {len(notes)} to {max_chars} chars"
+            )
+            notes = notes[:max_chars]
 
-        return self._combine_chunk_results(chunk_results)
+        return await self.llm_service.extract_resume_data(notes)
 
-    def _combine_chunk_results(
-        self, chunk_results: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
+    async def _summarize_chunks(self, text: str) -> str:
         """
-        Combine results from multiple chunks
+        Condense text into notes, one concurrent call per chunk
 
         Args:
-            chunk_results (List[Dict[str, Any]]): List of chunk results
+            text (str): Text to condense
 
         Returns:
-            Dict[str, Any]: Combined result
+            str: Notes for every chunk that succeeded, joined by newlines
         """
-        if len(chunk_results) == 1:
-            return chunk_results[0]
-
-        combined = chunk_results[0].copy()
-
-        if "contact_info" in combined and combined["contact_info"]:
-
-            pass
-
-        for key in ["work_experience", "education", "certifications"]:
-            combined[key] = []
-            seen_items = set()
-
-            for result in chunk_results:
-                if key in result and result[key]:
-                    for item in result[key]:
-
-                        if key == "work_experience":
-                            identifier = (
-                                f"{item.get('role', '')}-{item.get('company', '')}"
-                            )
-                        elif key == "education":
-                            identifier = f"{item.get('degree', '')}-{item.get('institution', '')}"
-                        elif key == "certifications":
-                            identifier = item.get("name", "")
-                        else:
-                            identifier = str(item)
-
-                        if identifier and identifier not in seen_items:
-                            combined[key].append(item)
-                            seen_items.add(identifier)
-
-        if "skills" in combined:
-            technical_skills = set()
-            soft_skills = set()
-
-            for result in chunk_results:
-                if "skills" in result and result["skills"]:
-                    if "technical_skills" in result["skills"]:
-                        technical_skills.update(result["skills"]["technical_skills"])
-                    if "soft_skills" in result["skills"]:
-                        soft_skills.update(result["skills"]["soft_skills"])
-
-            combined["skills"]["technical_skills"] = list(technical_skills)
-            combined["skills"]["soft_skills"] = list(soft_skills)
-
-        best_summary = ""
-        for result in chunk_results:
-            if (
-                "summary" in result
-                and result["summary"]
-                and len(result["summary"]) > len(best_summary)
-            ):
-                best_summary = result["summary"]
-
-        combined["summary"] = best_summary
-
-        return combined
+        from app.utils.extractor import chunk_for_llm
+
+        chunks = chunk_for_llm(
+            text, chunk_size=self.llm_service.max_input_chars, overlap=500
+        )
+        logger.info(f"Text chunked into {len(chunks)} pieces")
+
+        semaphore = asyncio.Semaphore(settings.LLM_CONCURRENCY)
+
+        async def summarize_chunk(i: int, chunk: str) -> str:
+            async with semaphore:
+                logger.info(f"Processing chunk {i+1}/{len(chunks)}")
+                return await self.llm_service.summarize_chunk(chunk)
+
+        results = await asyncio.gather(
+            *(summarize_chunk(i, chunk) for i, chunk in enumerate(chunks)),
+            return_exceptions=True,
+        )
+
+        chunk_notes = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to process chunk {i+1}: {result}")
+                continue
+            chunk_notes.append(result)
+
+        if not chunk_notes:
+            raise Exception("Failed to extract data from any chunks")
+
+        return "\n".join(chunk_notes)
 
 
 llm_service = LLMService()
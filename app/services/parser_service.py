@@ -1,7 +1,7 @@
+import time
 import uuid
+import asyncio
 from typing import Dict, Any, Optional, Tuple, List
-from pathlib import Path
-from datetime import datetime
 
 
 from langgraph.graph import StateGraph, END
@@ -9,6 +9,7 @@ from langgraph.checkpoint.memory import MemorySaver
 
 from app.models import Resume
 from app.schemas import ResumeDataSchema
+from app.services import llm_cache
 from app.services.llm_service import extraction_chain
 from app.utils.extractor import extract_and_clean_text
 from app.utils.logger import (
@@ -24,13 +25,26 @@ logger = get_logger("app.services.parser_service")
 class ResumeParsingState:
     """State object for resume parsing workflow"""
 
+    __slots__ = (
+        "file_path",
+        "original_filename",
+        "file_type",
+        "extracted_text",
+        "cleaned_text",
+        "extracted_data",
+        "validation_errors",
+        "document_id",
+        "error_message",
+        "processing_time",
+    )
+
     def __init__(self):
         self.file_path: Optional[str] = None
         self.original_filename: Optional[str] = None
         self.file_type: Optional[str] = None
         self.extracted_text: Optional[str] = None
         self.cleaned_text: Optional[str] = None
-        self.extracted_data: Optional[Dict[str, Any]] = None
+        self.extracted_data: Optional[ResumeDataSchema] = None
         self.validation_errors: Optional[List[str]] = None
         self.document_id: Optional[str] = None
         self.error_message: Optional[str] = None
@@ -38,10 +52,17 @@ class ResumeParsingState:
 
 
 class ResumeParsingWorkflow:
-    """LangGraph workflow for resume parsing"""
+    """
+    LangGraph workflow for resume parsing
 
-    def __init__(self):
-        self.checkpoint_memory = MemorySaver()
+    Checkpointing is off by default: the workflow is a single straight
+    pass, and a checkpointer would snapshot the full state (including the
+    extracted text) after every node. Enable it to inspect runs with
+    ResumeParserService.get_parsing_status.
+    """
+
+    def __init__(self, enable_checkpointing: bool = False):
+        self.checkpoint_memory = MemorySaver() if enable_checkpointing else None
         self.workflow = self._create_workflow()
 
     def _create_workflow(self) -> StateGraph:
@@ -58,8 +79,18 @@ class ResumeParsingWorkflow:
 
         workflow.set_entry_point("extract_text")
 
-        workflow.add_edge("extract_text", "clean_text")
-        workflow.add_edge("clean_text", "extract_data")
+        # A failed step goes straight to handle_error so later nodes do not
+        # overwrite its error_message with a less specific one
+        workflow.add_conditional_edges(
+            "extract_text",
+            self._check_step_result,
+            {"ok": "clean_text", "error": "handle_error"},
+        )
+        workflow.add_conditional_edges(
+            "clean_text",
+            self._check_step_result,
+            {"ok": "extract_data", "error": "handle_error"},
+        )
 
         workflow.add_conditional_edges(
             "extract_data",
@@ -78,11 +109,13 @@ class ResumeParsingWorkflow:
             original_filename = state.get("original_filename")
 
             log_parse_start(original_filename)
-            start_time = datetime.now()
+            start_time = time.perf_counter()
 
-            extracted_text = extract_and_clean_text(file_path)
+            extracted_text = await asyncio.to_thread(
+                extract_and_clean_text, file_path, content=state.get("file_content")
+            )
 
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
 
             logger.info(
                 f"Successfully extracted text from {original_filename} in {processing_time:.2f}s"
@@ -94,32 +127,32 @@ class ResumeParsingWorkflow:
 
         except Exception as e:
             logger.error(f"Text extraction failed: {e}")
-            return {
-                "error_message": f"Text extraction failed: {str(e)}",
-                "processing_time": 0,
-            }
+            state["error_message"] = f"Text extraction failed: {str(e)}"
+            state.setdefault("processing_time", 0)
+            return state
 
     async def _clean_text_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Clean and preprocess extracted text"""
+        """
+        Check the extracted text and hand it on for data extraction
+
+        extract_and_clean_text already runs TextCleaner.clean_resume_text
+        (and caches its output), so the text is not cleaned a second time.
+        """
         try:
             extracted_text = state.get("extracted_text")
 
             if not extracted_text:
                 raise ValueError("No text to clean")
 
-            from app.utils.extractor import text_cleaner
-
-            cleaned_text = text_cleaner.clean_text(extracted_text)
-            cleaned_text = text_cleaner.remove_resume_noise(cleaned_text)
-
-            logger.info(f"Text cleaned successfully, length: {len(cleaned_text)}")
-            state["cleaned_text"] = cleaned_text
+            logger.info(f"Text cleaned successfully, length: {len(extracted_text)}")
+            state["cleaned_text"] = extracted_text
 
             return state
 
         except Exception as e:
             logger.error(f"Text cleaning failed: {e}")
-            return {"error_message": f"Text cleaning failed: {str(e)}"}
+            state["error_message"] = f"Text cleaning failed: {str(e)}"
+            return state
 
     async def _extract_data_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Extract structured data using LLM"""
@@ -131,24 +164,42 @@ class ResumeParsingWorkflow:
 
             try:
 
-                extracted_data = await extraction_chain.extract_from_text(cleaned_text)
+                cache_key = llm_cache.prompt_hash(cleaned_text)
+                cached_data = await asyncio.to_thread(llm_cache.get, cache_key)
+
+                extracted_data = None
+                if cached_data is not None:
+                    try:
+                        extracted_data = ResumeDataSchema.model_validate(cached_data)
+                        logger.info("Using cached structured data for text")
+                    except Exception as e:
+                        logger.warning(f"Ignoring invalid cached structured data: {e}")
+
+                if extracted_data is None:
+                    extracted_data = await extraction_chain.extract_from_text(
+                        cleaned_text
+                    )
+                    await asyncio.to_thread(
+                        llm_cache.put,
+                        cache_key,
+                        extracted_data.model_dump(mode="json"),
+                    )
 
                 logger.info("Successfully extracted structured data from text")
                 state["extracted_data"] = extracted_data
                 state["validation_passed"] = True
             except Exception as e:
                 logger.error(f"Data extraction failed: {e}")
-                state = {
-                    "error_message": f"Data extraction failed: {str(e)}",
-                    "validation_passed": False,
-                    "validation_errors": [repr(e)],
-                }
+                state["error_message"] = f"Data extraction failed: {str(e)}"
+                state["validation_passed"] = False
+                state["validation_errors"] = [repr(e)]
 
             return state
 
         except Exception as e:
             logger.error(f"Data extraction failed: {e}")
-            return {"error_message": f"Data extraction failed: {str(e)}"}
+            state["error_message"] = f"Data extraction failed: {str(e)}"
+            return state
 
     async def _validate_data_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Validate extracted data"""
@@ -168,7 +219,9 @@ class ResumeParsingWorkflow:
 
         except Exception as e:
             logger.error(f"Data validation failed: {e}")
-            return {"validation_passed": False, "validation_errors": [str(e)]}
+            state["validation_passed"] = False
+            state["validation_errors"] = [str(e)]
+            return state
 
     async def _save_to_database_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Save parsed resume to database"""
@@ -177,17 +230,16 @@ class ResumeParsingWorkflow:
             original_filename = state.get("original_filename")
             file_path = state.get("file_path")
 
-            document_id = str(uuid.uuid4())
-
-            file_type = Path(original_filename).suffix.lower().lstrip(".")
+            resume_id = uuid.uuid4()
+            document_id = str(resume_id)
 
             resume = Resume.create_from_data(
                 filename=original_filename,
-                file_type=file_type,
-                extracted_data=extracted_data,
+                file_type=state.get("file_type"),
+                extracted_data=extracted_data.model_dump(mode="json"),
                 file_path=file_path,
             )
-            resume.id = uuid.UUID(document_id)
+            resume.id = resume_id
 
             logger.info(f"Resume saved to database with ID: {document_id}")
             state["document_id"] = document_id
@@ -197,7 +249,8 @@ class ResumeParsingWorkflow:
 
         except Exception as e:
             logger.error(f"Database save failed: {e}")
-            return {"error_message": f"Database save failed: {str(e)}"}
+            state["error_message"] = f"Database save failed: {str(e)}"
+            return state
 
     async def _handle_error_node(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Handle workflow errors"""
@@ -208,7 +261,13 @@ class ResumeParsingWorkflow:
         if validation_errors:
             logger.error(f"Validation errors: {validation_errors}")
 
-        return {"error_message": error_message, "validation_errors": validation_errors}
+        state["error_message"] = error_message
+        state["validation_errors"] = validation_errors
+        return state
+
+    def _check_step_result(self, state: Dict[str, Any]) -> str:
+        """Check if the previous step recorded an error"""
+        return "error" if state.get("error_message") else "ok"
 
     def _check_validation_result(self, state: Dict[str, Any]) -> str:
         """Check if validation passed"""
@@ -219,11 +278,16 @@ class ResumeParsingWorkflow:
 class ResumeParserService:
     """Main service for resume parsing operations"""
 
-    def __init__(self):
-        self.workflow: StateGraph = ResumeParsingWorkflow()
+    def __init__(self, enable_checkpointing: bool = False):
+        self.workflow: StateGraph = ResumeParsingWorkflow(enable_checkpointing)
 
     async def parse_resume(
-        self, file_path: str, original_filename: str, unique_id: str, db_session=None
+        self,
+        file_path: str,
+        original_filename: str,
+        unique_id: str,
+        db_session=None,
+        file_content: Optional[bytes] = None,
     ) -> Tuple[bool, Dict[str, Any], Optional[str]]:
         """
         Parse a resume file and return structured data
@@ -231,7 +295,11 @@ class ResumeParserService:
         Args:
             file_path (str): Path to the uploaded file
             original_filename (str): Original filename
-            db_session: Database session for saving results
+            db_session: Database session the resume record is added to; the
+                caller is responsible for committing it in its own
+                transaction. Without a session the record is not persisted.
+            file_content (bytes, optional): Uploaded bytes already in memory,
+                so text extraction does not read the file back from disk
 
         Returns:
             Tuple[bool, Dict[str, Any], Optional[str]]:
@@ -239,10 +307,13 @@ class ResumeParserService:
         """
         try:
 
+            _, dot, extension = original_filename.rpartition(".")
+
             initial_state = {
                 "file_path": file_path,
                 "original_filename": original_filename,
-                "file_type": Path(original_filename).suffix.lower().lstrip("."),
+                "file_type": extension.lower() if dot else "",
+                "file_content": file_content,
             }
 
             result = await self.workflow.workflow.ainvoke(
@@ -263,7 +334,11 @@ class ResumeParserService:
             extracted_data = result.get("extracted_data", {})
             processing_time = result.get("processing_time", 0)
 
-            if db_session and document_id:
+            if db_session is None:
+                logger.warning(
+                    f"No database session given, resume {document_id} is not persisted"
+                )
+            elif document_id:
                 try:
                     resume_data = result.get("resume_record")
                     if resume_data:
@@ -273,10 +348,8 @@ class ResumeParserService:
                             extracted_data=resume_data["extracted_data"],
                             file_path=resume_data.get("file_path"),
                         )
-
+                        resume_record.id = uuid.UUID(document_id)
                         db_session.add(resume_record)
-                        await db_session.commit()
-                        await db_session.refresh(resume_record)
                 except Exception as db_error:
                     logger.error(f"Failed to save to database: {db_error}")
 
@@ -309,6 +382,13 @@ class ResumeParserService:
         Returns:
             Dict[str, Any]: Status information
         """
+        if self.workflow.checkpoint_memory is None:
+            return {
+                "thread_id": thread_id,
+                "status": "error",
+                "error": "Workflow checkpointing is disabled",
+            }
+
         try:
 
             config = {"configurable": {"thread_id": thread_id}}
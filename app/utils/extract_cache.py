@@ -0,0 +1,88 @@
+import hashlib
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.file_cache import FileCache
+from app.utils.logger import get_logger
+
+logger = get_logger("app.utils.extract_cache")
+
+HASH_CHUNK_SIZE = 1 << 20
+
+_cache = FileCache(
+    "extract", settings.EXTRACT_CACHE_DIR, ".txt", settings.EXTRACT_CACHE_TTL
+)
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Compute the SHA-256 hex digest of a file's contents
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hex digest used as the cache key
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_digest(content: bytes) -> str:
+    """
+    Compute the SHA-256 hex digest of in-memory file contents
+
+    Args:
+        content (bytes): File contents
+
+    Returns:
+        str: Hex digest used as the cache key
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def get(digest: str) -> Optional[str]:
+    """
+    Get cached cleaned text for a file digest
+
+    Args:
+        digest (str): Cache key built from the file digest
+
+    Returns:
+        Optional[str]: Cached text, or None on a miss or expired entry
+    """
+    data = _cache.get(digest)
+    if data is None:
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        logger.warning(f"Failed to decode extract cache entry {digest}: {e}")
+        return None
+
+
+def put(digest: str, text: str) -> None:
+    """
+    Store cleaned text for a file digest
+
+    Args:
+        digest (str): Cache key built from the file digest
+        text (str): Cleaned extracted text
+    """
+    _cache.put(digest, text.encode("utf-8"))
+
+
+def prune_expired() -> int:
+    """
+    Delete every expired cache entry
+
+    Entries hold raw resume text, so they are removed from disk once
+    expired rather than left until the same file is submitted again.
+
+    Returns:
+        int: Number of entries deleted
+    """
+    return _cache.prune_expired()
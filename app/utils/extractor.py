@@ -1,7 +1,23 @@
+import io
+import os
 import re
-from typing import List
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Union
 from pathlib import Path
 
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+from app.utils import extract_cache
 from app.utils.logger import (
     get_logger,
     log_extraction_start,
@@ -10,6 +26,119 @@ from app.utils.logger import (
 
 logger = get_logger("app.utils.extractor")
 
+# Part of the extract cache key. Bump whenever DocumentExtractor or
+# TextCleaner output changes so text cleaned the old way is not served.
+TEXT_PIPELINE_VERSION = 1
+
+_WS_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n\s*\n")
+_NUM_COMMA_RE = re.compile(r"([0-9]+)\s*([,.])\s*([0-9]+)")
+_PAGE_NUMBER_RE = re.compile(r"\n\d+\s*\n")
+_HEADER_FOOTER_RE = re.compile(r"\n[^\n]{1,100}\s*\|\s*[^\n]{1,100}\n")
+_REPEATED_PUNCT_RE = re.compile(r"([.!?])\1+")
+_NOISE_RE = re.compile(
+    r"(?i)references available upon request|objective:|personal information"
+    r"|date of birth|marital status|nationality|passport number|driver.s license"
+)
+_DUPLICATE_EMAIL_RE = re.compile(r"\n([^\n]*@[^\n]*[^\s])\s*\1")
+_DUPLICATE_PHONE_RE = re.compile(r"\n([^\n]*\d{3}[-.\s]?\d{3}[-.\s]?\d{4})\s*\1")
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+_QUOTE_TABLE = str.maketrans(
+    {"“": '"', "”": '"', "‘": "'", "’": "'", "–": "-", "—": "-"}
+)
+
+# The clean_text and remove_resume_noise substitutions that can still match
+# after the whitespace collapse, as one alternation. The line-based rules
+# (blank lines, page numbers, headers/footers, duplicate email and phone
+# lines) need newlines, which the collapse has already removed. Inner
+# groups are named because numbered groups would shift when the patterns
+# are combined.
+_CLEANUP_PATTERNS = {
+    "num_comma": r"(?P<num_a>[0-9]+)\s*(?P<num_sep>[,.])\s*(?P<num_b>[0-9]+)",
+    "repeated_punct": r"(?P<punct>[.!?])(?P=punct)+",
+    "noise": _NOISE_RE.pattern.removeprefix("(?i)"),
+}
+_CLEANUP_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _CLEANUP_PATTERNS.items()),
+    re.IGNORECASE,
+)
+
+
+def _cleanup_replacement(match: re.Match) -> str:
+    """Replacement for a single _CLEANUP_RE match"""
+    kind = match.lastgroup
+    if kind == "num_comma":
+        return match["num_a"] + match["num_sep"] + match["num_b"]
+    if kind == "repeated_punct":
+        return match["punct"]
+    return ""
+
+
+PDF_PARALLEL_MIN_PAGES = 16
+PDF_PAGES_PER_WORKER = 8
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared process pool for PDF page extraction
+
+    Workers are started with forkserver (spawn where it is unavailable)
+    rather than fork: the API process runs the event loop, database pool
+    and logging threads, and forking a multithreaded process can leave a
+    child blocked on an inherited lock.
+    """
+    global _pdf_pool
+    if _pdf_pool is None:
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context(start_method),
+        )
+    return _pdf_pool
+
+
+def start_pdf_pool() -> None:
+    """Create the PDF process pool up front instead of on first use"""
+    _get_pdf_pool()
+
+
+def shutdown_pdf_pool() -> None:
+    """Shut down the PDF process pool, if it was started"""
+    global _pdf_pool
+    if _pdf_pool is not None:
+        _pdf_pool.shutdown(wait=True, cancel_futures=True)
+        _pdf_pool = None
+
+
+def _write_pdf_pages(doc, buf: io.StringIO, start: int, end: int, flags: int) -> None:
+    """Write the text of pages [start, end) of an open PDF into buf"""
+    for page_num in range(start, end):
+        text = doc[page_num].get_text("text", flags=flags)
+        if text and not text.isspace():
+            buf.write(f"\n--- Page {page_num + 1} ---\n")
+            buf.write(text)
+
+
+def _open_pdf(source: Union[str, bytes]):
+    """Open a PDF from a path or from its in-memory bytes"""
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def _extract_pdf_range(pdf_path: str, start: int, end: int, flags: int) -> str:
+    """Extract pages [start, end) of a PDF; runs inside a worker process"""
+    buf = io.StringIO()
+    with fitz.open(pdf_path) as doc:
+        _write_pdf_pages(doc, buf, start, end, flags)
+    return buf.getvalue()
+
 
 class DocumentExtractor:
     """Extract text from PDF and DOCX documents"""
@@ -21,12 +150,17 @@ class DocumentExtractor:
         """Check if file extension is supported"""
         return any(filename.lower().endswith(ext) for ext in self.supported_extensions)
 
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(
+        self, source: Union[str, bytes], filename: Optional[str] = None
+    ) -> str:
         """
-        Extract text from a document file
+        Extract text from a document file or its in-memory contents
 
         Args:
-            file_path (str): Path to the document file
+            source (Union[str, bytes]): Path to the document file, or the
+                file's bytes when they are already in memory
+            filename (str, optional): Name used to detect the file type;
+                required when source is bytes
 
         Returns:
             str: Extracted text
@@ -35,97 +169,179 @@ class DocumentExtractor:
             ValueError: If file type is not supported
             FileNotFoundError: If file does not exist
         """
-        file_path = Path(file_path)
-
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        if isinstance(source, bytes):
+            if not filename:
+                raise ValueError("filename is required when extracting from bytes")
+            file_path = Path(filename)
+        else:
+            file_path = Path(source)
+            if not file_path.exists():
+                raise FileNotFoundError(f"File not found: {file_path}")
+            source = file_path
 
         if not self.is_supported_file(file_path.name):
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
 
         logger.info(f"Extracting text from {file_path}")
 
-        if file_path.suffix.lower() == ".pdf":
-            return self._extract_pdf_text(file_path)
-        elif file_path.suffix.lower() == ".docx":
-            return self._extract_docx_text(file_path)
+        suffix = file_path.suffix.lower()
+        if suffix == ".pdf":
+            return self._extract_pdf_text(source, file_path)
+        elif suffix == ".docx":
+            return self._extract_docx_text(source)
         else:
             raise ValueError(f"Unsupported file type: {file_path.suffix}")
 
-    def _extract_pdf_text(self, file_path: Path) -> str:
+    def _extract_pdf_text(
+        self, source: Union[Path, bytes], file_path: Optional[Path] = None
+    ) -> str:
         """
         Extract text from PDF using PyMuPDF
 
+        PDFs with at least PDF_PARALLEL_MIN_PAGES pages are split into
+        PDF_PAGES_PER_WORKER page ranges and extracted in a process pool;
+        shorter ones are read serially to avoid the worker overhead.
+
         Args:
-            file_path (Path): Path to PDF file
+            source (Union[Path, bytes]): Path to PDF file or its bytes
+            file_path (Path, optional): Where the file lives on disk, if
+                anywhere; lets workers open it instead of receiving bytes
 
         Returns:
             str: Extracted text
         """
-        try:
-            import fitz
+        if fitz is None:
+            raise ImportError(
+                "PyMuPDF (fitz) not installed. Please install with: pip install pymupdf"
+            )
 
-            logger.info(f"Extracting PDF text from {file_path}")
+        try:
+            if isinstance(source, Path):
+                source = str(source)
+                logger.info(f"Extracting PDF text from {source}")
+            else:
+                logger.info(f"Extracting PDF text from {len(source)} bytes in memory")
 
-            with fitz.open(str(file_path)) as doc:
-                text_parts = []
+            flags = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
 
-                for page_num, page in enumerate(doc.pages(), 1):
-                    text = page.get_text()
-                    if text.strip():
-                        text_parts.append(f"\n--- Page {page_num} ---\n")
-                        text_parts.append(text)
+            with _open_pdf(source) as doc:
+                if doc.page_count < PDF_PARALLEL_MIN_PAGES:
+                    buf = io.StringIO()
+                    _write_pdf_pages(doc, buf, 0, doc.page_count, flags)
+                    full_text = buf.getvalue()
+                else:
+                    full_text = self._extract_pdf_parallel(
+                        source, file_path, doc.page_count, flags
+                    )
 
-                full_text = "".join(text_parts)
-                logger.info(f"Extracted {len(full_text)} characters from PDF")
+            logger.info(f"Extracted {len(full_text)} characters from PDF")
 
-                return full_text
+            return full_text
 
-        except ImportError:
-            raise ImportError(
-                "PyMuPDF (fitz) not installed. Please install with: pip install pymupdf"
-            )
         except Exception as e:
             logger.error(f"Error extracting PDF text: {e}")
             raise
 
-    def _extract_docx_text(self, file_path: Path) -> str:
+    def _extract_pdf_parallel(
+        self,
+        source: Union[str, bytes],
+        file_path: Optional[Path],
+        page_count: int,
+        flags: int,
+    ) -> str:
         """
-        Extract text from DOCX using python-docx
+        Extract a long PDF in page ranges across the process pool
+
+        Workers are sent a file path rather than the PDF bytes, which would
+        otherwise be pickled once per shard. In-memory PDFs that are not on
+        disk are written to a temporary file first.
 
         Args:
-            file_path (Path): Path to DOCX file
+            source (Union[str, bytes]): Path to PDF file or its bytes
+            file_path (Path, optional): Where the file lives on disk, if
+                anywhere
+            page_count (int): Number of pages in the PDF
+            flags (int): PyMuPDF text extraction flags
 
         Returns:
-            str: Extracted text
+            str: Extracted text, in page order
         """
+        starts = range(0, page_count, PDF_PAGES_PER_WORKER)
+        ends = [min(start + PDF_PAGES_PER_WORKER, page_count) for start in starts]
+        shard_count = len(starts)
+
+        logger.info(f"Extracting {page_count} PDF pages in {shard_count} shards")
+
+        if isinstance(source, str):
+            return self._map_pdf_ranges(source, starts, ends, flags)
+        if file_path is not None and file_path.is_file():
+            return self._map_pdf_ranges(str(file_path), starts, ends, flags)
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp.write(source)
         try:
-            from docx import Document
+            return self._map_pdf_ranges(tmp.name, starts, ends, flags)
+        finally:
+            os.unlink(tmp.name)
+
+    def _map_pdf_ranges(
+        self, pdf_path: str, starts: range, ends: List[int], flags: int
+    ) -> str:
+        """Run _extract_pdf_range for each page range and join the results"""
+        shard_count = len(starts)
+        return "".join(
+            _get_pdf_pool().map(
+                _extract_pdf_range,
+                [pdf_path] * shard_count,
+                starts,
+                ends,
+                [flags] * shard_count,
+            )
+        )
+
+    def _extract_docx_text(self, source: Union[Path, bytes]) -> str:
+        """
+        Extract text from DOCX using python-docx
+
+        Args:
+            source (Union[Path, bytes]): Path to DOCX file or its bytes
 
-            logger.info(f"Extracting DOCX text from {file_path}")
+        Returns:
+            str: Extracted text
+        """
+        if Document is None:
+            raise ImportError(
+                "python-docx not installed. Please install with: pip install python-docx"
+            )
 
-            doc = Document(str(file_path))
-            text_parts = []
+        try:
+            if isinstance(source, bytes):
+                logger.info(f"Extracting DOCX text from {len(source)} bytes in memory")
+                doc = Document(io.BytesIO(source))
+            else:
+                logger.info(f"Extracting DOCX text from {source}")
+                doc = Document(str(source))
+            buf = io.StringIO()
 
             for para in doc.paragraphs:
-                if para.text.strip():
-                    text_parts.append(para.text)
+                text = para.text
+                if text and not text.isspace():
+                    buf.write(text)
+                    buf.write("\n")
 
             for table in doc.tables:
                 for row in table.rows:
                     for cell in row.cells:
-                        if cell.text.strip():
-                            text_parts.append(cell.text)
+                        text = cell.text
+                        if text and not text.isspace():
+                            buf.write(text)
+                            buf.write("\n")
 
-            full_text = "\n".join(text_parts)
+            full_text = buf.getvalue().removesuffix("\n")
             logger.info(f"Extracted {len(full_text)} characters from DOCX")
 
             return full_text
 
-        except ImportError:
-            raise ImportError(
-                "python-docx not installed. Please install with: pip install python-docx"
-            )
         except Exception as e:
             logger.error(f"Error extracting DOCX text: {e}")
             raise
@@ -148,20 +364,38 @@ class TextCleaner:
         if not text:
             return ""
 
-        text = re.sub(r"\s+", " ", text)
+        text = _WS_RE.sub(" ", text)
         text = text.strip()
 
-        text = re.sub(r"\n\s*\n\s*\n", "\n\n", text)
-        text = re.sub(r"([0-9]+)\s*([,.])\s*([0-9]+)", r"\1\2\3", text)
+        text = _BLANK_LINES_RE.sub("\n\n", text)
+        text = _NUM_COMMA_RE.sub(r"\1\2\3", text)
 
-        text = re.sub(r"\n\d+\s*\n", "\n", text)
-        text = re.sub(r"\n[^\n]{1,100}\s*\|\s*[^\n]{1,100}\n", "\n", text)
+        text = _PAGE_NUMBER_RE.sub("\n", text)
+        text = _HEADER_FOOTER_RE.sub("\n", text)
 
-        text = text.replace("“", '"').replace("”", '"')
-        text = text.replace("‘", "'").replace("’", "'")
-        text = text.replace("–", "-").replace("—", "-")
+        text = text.translate(_QUOTE_TABLE)
 
-        text = re.sub(r"([.!?])\1+", r"\1", text)
+        text = _REPEATED_PUNCT_RE.sub(r"\1", text)
+
+        return text.strip()
+
+    @staticmethod
+    def clean_resume_text(text: str) -> str:
+        """
+        Apply clean_text and remove_resume_noise in a single regex pass
+
+        Args:
+            text (str): Raw extracted text
+
+        Returns:
+            str: Cleaned text with resume noise removed
+        """
+        if not text:
+            return ""
+
+        text = _WS_RE.sub(" ", text).strip()
+        text = text.translate(_QUOTE_TABLE)
+        text = _CLEANUP_RE.sub(_cleanup_replacement, text)
 
         return text.strip()
 
@@ -179,22 +413,10 @@ class TextCleaner:
         if not text:
             return ""
 
-        noise_patterns = [
-            r"(?i)references available upon request",
-            r"(?i)objective:",
-            r"(?i)personal information",
-            r"(?i)date of birth",
-            r"(?i)marital status",
-            r"(?i)nationality",
-            r"(?i)passport number",
-            r"(?i)driver.s license",
-        ]
+        text = _NOISE_RE.sub("", text)
 
-        for pattern in noise_patterns:
-            text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-        text = re.sub(r"\n([^\n]*@[^\n]*[^\s])\s*\1", r"\n\1", text)
-        text = re.sub(r"\n([^\n]*\d{3}[-.\s]?\d{3}[-.\s]?\d{4})\s*\1", r"\n\1", text)
+        text = _DUPLICATE_EMAIL_RE.sub(r"\n\1", text)
+        text = _DUPLICATE_PHONE_RE.sub(r"\n\1", text)
 
         return text.strip()
 
@@ -210,10 +432,12 @@ class TextChunker:
         """
         Split text into overlapping chunks
 
+        Chunks end on sentence boundaries and are sliced from the original
+        text by offset, so a sentence longer than chunk_size becomes a chunk
+        of its own.
+
         Args:
             text (str): Text to chunk
-            chunk_size (int): Maximum size of each chunk
-            chunk_overlap (int): Overlap between chunks
 
         Returns:
             List[str]: List of text chunks
@@ -221,30 +445,27 @@ class TextChunker:
         if not text:
             return []
 
-        sentences = re.split(r"[.!?]+", text)
-        sentences = [s.strip() for s in sentences if s.strip()]
+        boundaries = [m.end() for m in _SENTENCE_SPLIT_RE.finditer(text)]
+        if not boundaries or boundaries[-1] != len(text):
+            boundaries.append(len(text))
 
         chunks = []
-        current_chunk = ""
+        start = end = 0
 
-        for sentence in sentences:
-            sentence_with_punct = sentence + "."
+        for boundary in boundaries:
+            if boundary - start > self.chunk_size and end > start:
+                chunk = text[start:end].strip()
+                if chunk:
+                    chunks.append(chunk)
 
-            if len(current_chunk + sentence_with_punct) <= self.chunk_size:
-                current_chunk += " " + sentence_with_punct
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
+                overlap_start = end - self.chunk_overlap
+                start = overlap_start if start < overlap_start < end else end
 
-                if self.chunk_overlap > 0:
+            end = boundary
 
-                    overlap_text = current_chunk[-self.chunk_overlap :]
-                    current_chunk = overlap_text + " " + sentence_with_punct
-                else:
-                    current_chunk = sentence_with_punct
-
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
 
         logger.info(
             f"Text chunked into {len(chunks)} chunks (size: {self.chunk_size}, overlap: {self.chunk_overlap})"
@@ -258,23 +479,43 @@ text_cleaner = TextCleaner()
 text_chunker = TextChunker()
 
 
-def extract_and_clean_text(file_path: str) -> str:
+def extract_and_clean_text(file_path: str, content: Optional[bytes] = None) -> str:
     """
     Extract and clean text from a document file
 
+    Results are cached by the SHA-256 of the file contents and
+    TEXT_PIPELINE_VERSION, so a file that is submitted again skips
+    extraction and cleaning.
+
     Args:
         file_path (str): Path to the document file
+        content (bytes, optional): The file's bytes, if already in memory;
+            the file is then not read from disk again
 
     Returns:
         str: Cleaned extracted text
     """
     log_extraction_start(file_path)
 
-    raw_text = document_extractor.extract_text(file_path)
-
-    cleaned_text = text_cleaner.clean_text(raw_text)
-    cleaned_text = text_cleaner.remove_resume_noise(cleaned_text)
-
+    if content is not None:
+        digest = extract_cache.content_digest(content)
+    else:
+        digest = extract_cache.file_digest(file_path)
+    digest = f"{digest}-v{TEXT_PIPELINE_VERSION}"
+    cached_text = extract_cache.get(digest)
+    if cached_text is not None:
+        logger.info(f"Using cached extracted text for {file_path}")
+        log_extraction_success(len(cached_text))
+        return cached_text
+
+    if content is not None:
+        raw_text = document_extractor.extract_text(content, filename=file_path)
+    else:
+        raw_text = document_extractor.extract_text(file_path)
+
+    cleaned_text = text_cleaner.clean_resume_text(raw_text)
+
+    extract_cache.put(digest, cleaned_text)
     log_extraction_success(len(cleaned_text))
 
     return cleaned_text
@@ -0,0 +1,97 @@
+import os
+import time
+from typing import Optional
+from pathlib import Path
+
+from app.utils.logger import get_logger
+
+logger = get_logger("app.utils.file_cache")
+
+
+class FileCache:
+    """
+    Directory of cache entries, one file per key, with an optional TTL
+
+    Entries are written to a temporary file and renamed into place so a
+    concurrent reader never sees a partial entry. Expired entries are
+    deleted when they are found and by prune_expired().
+    """
+
+    def __init__(self, name: str, directory: str, suffix: str, ttl: Optional[int]):
+        self.name = name
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        """Get the on-disk location of a cache entry"""
+        return self.directory / f"{key}{self.suffix}"
+
+    def _is_expired(self, mtime: float) -> bool:
+        """Check if an entry written at mtime is past the TTL"""
+        return self.ttl is not None and time.time() - mtime > self.ttl
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cache entry
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[bytes]: Entry contents, or None on a miss or expired entry
+        """
+        path = self._path(key)
+        try:
+            if self._is_expired(path.stat().st_mtime):
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read {self.name} cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store a cache entry
+
+        Args:
+            key (str): Cache key
+            data (bytes): Entry contents
+        """
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Failed to write {self.name} cache entry {key}: {e}")
+
+    def prune_expired(self) -> int:
+        """
+        Delete every expired cache entry
+
+        Returns:
+            int: Number of entries deleted
+        """
+        if self.ttl is None or not self.directory.is_dir():
+            return 0
+
+        removed = 0
+        for entry in self.directory.glob(f"*{self.suffix}"):
+            try:
+                if self._is_expired(entry.stat().st_mtime):
+                    entry.unlink(missing_ok=True)
+                    removed += 1
+            except OSError as e:
+                logger.warning(
+                    f"Failed to prune {self.name} cache entry {entry.name}: {e}"
+                )
+
+        if removed:
+            logger.info(f"Pruned {removed} expired {self.name} cache entries")
+        return removed
@@ -1,10 +1,48 @@
 import sys
+import time
+import traceback
 from pathlib import Path
+
+import orjson
 from loguru import logger as loguru_logger
 
 from app.core.config import settings
 
 
+def _orjson_format(record) -> str:
+    """
+    Format a record for the JSON sink using orjson
+
+    The JSON line is stashed in ``extra`` and referenced from the returned
+    template, because loguru formats the template again with the record
+    and the braces in the JSON would otherwise be interpreted. Loguru does
+    not append the traceback for a callable format, so it is included in
+    the payload.
+    """
+    extra = {k: v for k, v in record["extra"].items() if k != "serialized"}
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "name": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+        "extra": extra,
+    }
+    if record["exception"] is not None:
+        exc_type, exc_value, exc_traceback = record["exception"]
+        payload["exception"] = {
+            "type": exc_type.__name__ if exc_type else None,
+            "value": str(exc_value),
+            "traceback": "".join(
+                traceback.format_exception(exc_type, exc_value, exc_traceback)
+            ),
+        }
+
+    record["extra"]["serialized"] = orjson.dumps(payload, default=str).decode()
+    return "{extra[serialized]}\n"
+
+
 def setup_logger():
     """Set up the application logger with Loguru"""
 
@@ -31,6 +69,8 @@ def setup_logger():
         compression="zip",
         backtrace=True,
         diagnose=True,
+        enqueue=True,
+        catch=True,
     )
 
     loguru_logger.add(
@@ -42,17 +82,20 @@ def setup_logger():
         compression="zip",
         backtrace=True,
         diagnose=True,
+        enqueue=True,
+        catch=True,
     )
 
     if settings.LOG_LEVEL == "INFO":
         loguru_logger.add(
             logs_dir / "app.json",
-            format="{message}",
+            format=_orjson_format,
             level="INFO",
             rotation="100 MB",
             retention="365 days",
             compression="zip",
-            serialize=True,
+            enqueue=True,
+            catch=True,
         )
 
     loguru_logger.info(f"Logger initialized with level: {settings.LOG_LEVEL}")
@@ -99,13 +142,12 @@ class LogTiming:
         self.start_time = None
 
     def __enter__(self):
-        self.start_time = loguru_logger.datetime.now()
+        self.start_time = time.perf_counter()
         self.logger.info(f"Starting {self.operation_name}")
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        end_time = loguru_logger.datetime.now()
-        duration = (end_time - self.start_time).total_seconds()
+        duration = time.perf_counter() - self.start_time
 
         if exc_type is None:
             self.logger.info(
@@ -139,12 +181,17 @@ def log_parse_error(filename: str, error: str):
     logger.log("PARSE", f"Failed to parse resume {filename}: {error}")
 
 
-def log_llm_call(prompt_tokens: int, completion_tokens: int, model: str):
+def log_llm_call(
+    prompt_tokens: int,
+    completion_tokens: int,
+    model: str,
+    cache_read_input_tokens: int = 0,
+):
     """Log LLM API call"""
     total_tokens = prompt_tokens + completion_tokens
     logger.log(
         "LLM",
-        f"LLM API call - Model: {model}, Tokens: {total_tokens} (prompt: {prompt_tokens}, completion: {completion_tokens})",
+        f"LLM API call - Model: {model}, Tokens: {total_tokens} (prompt: {prompt_tokens}, completion: {completion_tokens}, cached prompt: {cache_read_input_tokens})",
     )
 
 
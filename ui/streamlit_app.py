@@ -1,7 +1,12 @@
 import os
-import requests
+import re
+import html
+import orjson
 import streamlit as st
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
+
+if TYPE_CHECKING:
+    import requests
 
 st.set_page_config(
     page_title="Resume Parser",
@@ -11,9 +16,61 @@ st.set_page_config(
 )
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+UPLOAD_URL = f"{API_BASE_URL}/api/upload"
+RESUME_URL = f"{API_BASE_URL}/api/resume/{{}}"
+HEALTH_URL = f"{API_BASE_URL}/health"
 MAX_FILE_SIZE = 10 * 1024 * 1024
 ALLOWED_FILE_TYPES = ["pdf", "docx"]
 
+_MAX_MB = MAX_FILE_SIZE // (1024 * 1024)
+_FORMATS = ", ".join(ALLOWED_FILE_TYPES)
+_FORMATS_UPPER = _FORMATS.upper()
+_ALLOWED_SET = frozenset(ALLOWED_FILE_TYPES)
+
+_RESP_SPLIT = re.compile(r"\n|; ")
+
+_CHIP_CSS = (
+    "<style>"
+    ".chip{padding:5px 10px;border-radius:5px;margin:5px;display:inline-block;"
+    "border:1px solid #ccc;color:#000}"
+    ".chip-tech{background:#f0f8ff}"
+    ".chip-soft{background:#f3e5f5}"
+    "</style>"
+)
+_TECH_CHIP = '<span class="chip chip-tech">{}</span>'
+_SOFT_CHIP = '<span class="chip chip-soft">{}</span>'
+
+
+@st.cache_resource
+def get_http_session() -> "requests.Session":
+    # requests is only imported the first time the API is actually used
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        # Uploads are streamed and cannot be replayed, so only GETs retry
+        allowed_methods=frozenset(["GET"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def parse_json_body(response) -> Dict[str, Any]:
+    if not response.content:
+        return {}
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError:
+        return {}
+
 
 def init_session_state():
     if "uploaded_file" not in st.session_state:
@@ -30,27 +87,55 @@ def validate_file(uploaded_file) -> tuple[bool, str]:
     if not uploaded_file:
         return False, "No file uploaded"
 
-    file_size = len(uploaded_file.getvalue())
-    if file_size > MAX_FILE_SIZE:
-        return False, f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)} MB"
+    _, dot, file_extension = uploaded_file.name.rpartition(".")
+    if not dot or file_extension.lower() not in _ALLOWED_SET:
+        return False, f"Unsupported file type. Allowed: {_FORMATS}"
 
-    file_extension = uploaded_file.name.split(".")[-1].lower()
-    if file_extension not in ALLOWED_FILE_TYPES:
-        return False, f"Unsupported file type. Allowed: {', '.join(ALLOWED_FILE_TYPES)}"
+    # getbuffer() is a zero-copy view, unlike getvalue()
+    file_size = getattr(uploaded_file, "size", None) or len(uploaded_file.getbuffer())
+    if file_size > MAX_FILE_SIZE:
+        return False, f"File too large. Maximum size: {_MAX_MB} MB"
 
     return True, ""
 
 
+class _BufferReader:
+    # No getvalue(), so MultipartEncoder reads it in chunks instead of
+    # copying the whole upload; len is the bytes left, as the encoder expects
+    def __init__(self, buffer: memoryview):
+        self._buffer = buffer
+        self._pos = 0
+
+    @property
+    def len(self) -> int:
+        return len(self._buffer) - self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._buffer) if size is None or size < 0 else self._pos + size
+        chunk = self._buffer[self._pos : end]
+        self._pos += len(chunk)
+        return bytes(chunk)
+
+
 def upload_resume(file) -> tuple[bool, Dict[str, Any], Optional[str]]:
+    import requests
+    from requests_toolbelt import MultipartEncoder
+
     try:
-        files = {"file": (file.name, file, file.type)}
-        response = requests.post(f"{API_BASE_URL}/api/upload", files=files, timeout=120)
+        body = _BufferReader(file.getbuffer())
+        encoder = MultipartEncoder(fields={"file": (file.name, body, file.type)})
+        response = get_http_session().post(
+            UPLOAD_URL,
+            data=encoder,
+            headers={"Content-Type": encoder.content_type},
+            timeout=120,
+        )
 
+        body = parse_json_body(response)
         if response.status_code == 201:
-            return True, response.json(), None
+            return True, body, None
         else:
-            error_detail = response.json().get("detail", "Unknown error")
-            return False, {}, error_detail
+            return False, {}, body.get("detail", "Unknown error")
 
     except requests.exceptions.Timeout:
         return False, {}, "Request timed out."
@@ -60,34 +145,52 @@ def upload_resume(file) -> tuple[bool, Dict[str, Any], Optional[str]]:
         return False, {}, str(e)
 
 
+class APIError(Exception):
+    pass
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _get_resume_cached(document_id: str) -> Dict[str, Any]:
+    # Failures raise so that st.cache_data only keeps successful responses
+    with get_http_session().get(
+        RESUME_URL.format(document_id), stream=True, timeout=30
+    ) as response:
+        body = parse_json_body(response)
+        status_code = response.status_code
+
+    if status_code == 200:
+        return body
+    raise APIError(body.get("detail", "Unknown error"))
+
+
 def get_resume(document_id: str) -> tuple[bool, Dict[str, Any], Optional[str]]:
     try:
-        response = requests.get(f"{API_BASE_URL}/api/resume/{document_id}", timeout=30)
-        if response.status_code == 200:
-            return True, response.json(), None
-        else:
-            error_detail = response.json().get("detail", "Unknown error")
-            return False, {}, error_detail
+        return True, _get_resume_cached(document_id), None
     except Exception as e:
         return False, {}, str(e)
 
 
+@st.cache_data(ttl=5, show_spinner=False)
+def _check_health() -> tuple[int, Dict[str, Any]]:
+    response = get_http_session().get(HEALTH_URL, timeout=10)
+    return response.status_code, parse_json_body(response)
+
+
 def display_contact_info(contact_info: Dict[str, Any]):
     st.subheader("Contact Information")
 
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        if contact_info.get("name"):
-            st.write(f"Name: {contact_info['name']}")
-    with col2:
-        if contact_info.get("email"):
-            st.write(f"Email: {contact_info['email']}")
-    with col3:
-        if contact_info.get("phone"):
-            st.write(f"Phone: {contact_info['phone']}")
-    with col4:
-        if contact_info.get("location"):
-            st.write(f"Location: {contact_info['location']}")
+    rows = [
+        f"**{label}:** {value}"
+        for label, value in (
+            ("Name", contact_info.get("name")),
+            ("Email", contact_info.get("email")),
+            ("Phone", contact_info.get("phone")),
+            ("Location", contact_info.get("location")),
+        )
+        if value
+    ]
+    if rows:
+        st.markdown("  \n".join(rows))
 
 
 def display_summary(summary: str):
@@ -106,44 +209,52 @@ def display_work_experience(work_experience: list):
         with st.expander(f"{exp.get('role', '')} at {exp.get('company', '')}"):
             col1, col2 = st.columns([2, 1])
             with col1:
+                # One markdown element per expander instead of one per line
+                lines = []
                 if exp.get("duration"):
-                    st.write(f"Duration: {exp['duration']}")
+                    lines.append(f"Duration: {exp['duration']}\n")
 
                 if exp.get("responsibilities"):
-                    st.write("Responsibilities:")
+                    lines.append("Responsibilities:\n")
                     responsibilities = exp["responsibilities"]
 
                     if isinstance(responsibilities, str):
-                        if "\n" in responsibilities:
-                            items = responsibilities.split("\n")
-                        elif "; " in responsibilities:
-                            items = responsibilities.split("; ")
-                        else:
-                            items = [responsibilities]
+                        items = _RESP_SPLIT.split(responsibilities)
                     else:
                         items = responsibilities
 
-                    for item in items:
-                        if item.strip():
-                            st.write(f"- {item.strip()}")
+                    lines.extend(f"- {s}" for s in (x.strip() for x in items) if s)
 
+                if lines:
+                    st.markdown("\n".join(lines))
 
-def display_education(education: list):
-    if not education:
+
+def _render_list(title: str, items: list, fields: list):
+    if not items:
         return
 
-    st.subheader("Education")
+    st.subheader(title)
+
+    blocks = []
+    for item in items:
+        lines = [
+            template.format(item[key]) if template else str(item[key])
+            for key, template in fields
+            if item.get(key)
+        ]
+        if lines:
+            blocks.append("  \n".join(lines))
 
-    for edu in education:
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            if edu.get("degree"):
-                st.write(edu["degree"])
-            if edu.get("institution"):
-                st.write(edu["institution"])
-        with col2:
-            if edu.get("year"):
-                st.write(f"Year: {edu['year']}")
+    if blocks:
+        st.markdown("\n\n".join(blocks))
+
+
+def display_education(education: list):
+    _render_list(
+        "Education",
+        education,
+        [("degree", None), ("institution", None), ("year", "Year: {}")],
+    )
 
 
 def display_skills(skills: Dict[str, Any]):
@@ -152,47 +263,62 @@ def display_skills(skills: Dict[str, Any]):
 
     st.subheader("Skills")
 
+    parts = []
     if skills.get("technical_skills"):
-        st.write("Technical Skills:")
-        tech_html = ""
-        for skill in skills["technical_skills"]:
-            tech_html += (
-                f'<span style="background-color:#f0f8ff;color:#000;border:1px solid #ccc;'
-                f'padding:5px 10px;border-radius:5px;margin:5px;display:inline-block;">{skill}</span>'
-            )
-        st.markdown(tech_html, unsafe_allow_html=True)
+        parts.append("<div>Technical Skills:</div>")
+        parts.extend(
+            _TECH_CHIP.format(html.escape(skill, quote=True))
+            for skill in skills["technical_skills"]
+        )
 
     if skills.get("soft_skills"):
-        st.write("Soft Skills:")
-        soft_html = ""
-        for skill in skills["soft_skills"]:
-            soft_html += (
-                f'<span style="background-color:#f3e5f5;color:#000;border:1px solid #ccc;'
-                f'padding:5px 10px;border-radius:5px;margin:5px;display:inline-block;">{skill}</span>'
-            )
-        st.markdown(soft_html, unsafe_allow_html=True)
+        parts.append("<div>Soft Skills:</div>")
+        parts.extend(
+            _SOFT_CHIP.format(html.escape(skill, quote=True))
+            for skill in skills["soft_skills"]
+        )
+
+    if parts:
+        st.markdown("".join(parts), unsafe_allow_html=True)
 
 
 def display_certifications(certifications: list):
-    if not certifications:
-        return
+    _render_list(
+        "Certifications",
+        certifications,
+        [("name", None), ("issuing_organization", None), ("year", "Year: {}")],
+    )
+
+
+# Runs as a fragment so widgets inside it, such as the raw data checkbox,
+# rerun only this section instead of the whole script
+@st.fragment
+def display_result():
+    result = st.session_state.processing_result
+    extracted_data = result.get("extracted_resume_data", {})
+
+    st.write(f"Document ID: {st.session_state.document_id}")
+    processing_time = result.get("processing_time", 0)
+    if processing_time:
+        st.write(f"Processing Time: {processing_time:.2f} seconds")
 
-    st.subheader("Certifications")
+    st.divider()
+
+    display_contact_info(extracted_data.get("contact_info", {}))
+    display_summary(extracted_data.get("summary"))
+    display_work_experience(extracted_data.get("work_experience", []))
+    display_education(extracted_data.get("education", []))
+    display_skills(extracted_data.get("skills", {}))
+    display_certifications(extracted_data.get("certifications", []))
 
-    for cert in certifications:
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            if cert.get("name"):
-                st.write(cert["name"])
-            if cert.get("issuing_organization"):
-                st.write(cert["issuing_organization"])
-        with col2:
-            if cert.get("year"):
-                st.write(f"Year: {cert['year']}")
+    # Only ship the raw payload to the browser when it is asked for
+    if st.checkbox("Show raw extracted data", value=False):
+        st.json(extracted_data)
 
 
 def main():
     init_session_state()
+    st.markdown(_CHIP_CSS, unsafe_allow_html=True)
 
     st.title("Resume Parser Application")
     st.write(
@@ -202,19 +328,18 @@ def main():
     with st.sidebar:
         st.header("Application Info")
         st.write(f"API Server: {API_BASE_URL}")
-        st.write(f"Max File Size: {MAX_FILE_SIZE // (1024*1024)} MB")
-        st.write(f"Supported Formats: {', '.join(ALLOWED_FILE_TYPES).upper()}")
+        st.write(f"Max File Size: {_MAX_MB} MB")
+        st.write(f"Supported Formats: {_FORMATS_UPPER}")
 
         if st.button("Test API Connection"):
             try:
-                response = requests.get(f"{API_BASE_URL}/health", timeout=10)
-                if response.status_code == 200:
+                status_code, health_data = _check_health()
+                if status_code == 200:
                     st.success("API Connection Successful")
-                    health_data = response.json()
                     st.write(f"Status: {health_data.get('status')}")
                     st.write(f"Version: {health_data.get('version')}")
                 else:
-                    st.error(f"API returned status {response.status_code}")
+                    st.error(f"API returned status {status_code}")
             except Exception as e:
                 st.error(f"Connection failed: {str(e)}")
 
@@ -223,7 +348,7 @@ def main():
     uploaded_file = st.file_uploader(
         "Choose a resume file",
         type=ALLOWED_FILE_TYPES,
-        help=f"Supported: {', '.join(ALLOWED_FILE_TYPES)}. Max size {MAX_FILE_SIZE // (1024*1024)} MB",
+        help=f"Supported: {_FORMATS}. Max size {_MAX_MB} MB",
     )
 
     col1, col2 = st.columns([1, 4])
@@ -297,25 +422,7 @@ def main():
                 st.error(error)
 
     if st.session_state.processing_result:
-        result = st.session_state.processing_result
-        extracted_data = result.get("extracted_resume_data", {})
-
-        st.write(f"Document ID: {st.session_state.document_id}")
-        processing_time = result.get("processing_time", 0)
-        if processing_time:
-            st.write(f"Processing Time: {processing_time:.2f} seconds")
-
-        st.divider()
-
-        display_contact_info(extracted_data.get("contact_info", {}))
-        display_summary(extracted_data.get("summary"))
-        display_work_experience(extracted_data.get("work_experience", []))
-        display_education(extracted_data.get("education", []))
-        display_skills(extracted_data.get("skills", {}))
-        display_certifications(extracted_data.get("certifications", []))
-
-        with st.expander("Raw Extracted Data"):
-            st.json(extracted_data)
+        display_result()
 
     elif st.session_state.error_message:
         st.error(st.session_state.error_message)